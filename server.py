@@ -2,10 +2,29 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from functools import wraps
+from contextlib import contextmanager
 import os
 import json
+import shutil
+import hashlib
+import threading
+import queue
+import zipfile
+import glob
+import click
 import jwt
 from datetime import datetime, timedelta
+from xml.etree import ElementTree
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines - fall back to an in-process lock
+    fcntl = None
+
+try:
+    import pymupdf  # Enables PDF page counts, text and previews
+except ImportError:
+    pymupdf = None
 
 app = Flask(__name__)
 
@@ -83,6 +102,22 @@ CASE_STUDIES_DIR_FILE = os.path.join(CASE_STUDIES_UPLOAD_FOLDER, 'directory.json
 RESOURCES_DIR_FILE = os.path.join(RESOURCES_UPLOAD_FOLDER, 'directory.json')
 GALLERY_DIR_FILE = os.path.join(GALLERY_UPLOAD_FOLDER, 'directory.json')
 TEAM_DIR_FILE = 'static/team/partners.json'
+DIRECTORY_FILES = [CASE_STUDIES_DIR_FILE, RESOURCES_DIR_FILE, GALLERY_DIR_FILE, TEAM_DIR_FILE]
+
+# Write lock shared by the web app and the backup/restore commands.
+# Kept outside static/ so a restore swapping the folder doesn't swap the lock too.
+DIRECTORY_LOCK_FILE = '.directory.lock'
+_directory_thread_lock = threading.Lock()
+
+# Backup Configuration
+STATIC_FOLDER = 'static'
+BACKUP_FOLDER = os.environ.get('BACKUP_DIR', os.path.expanduser('~/backups'))
+BACKUP_CHUNK_SIZE = 1024 * 1024
+
+# Resource document extraction configuration
+EXTRACTION_VERSION = 1  # Bump to re-extract cached documents
+PREVIEW_WIDTH = 600     # Preview image width in pixels
+PREVIEW_EXTENSIONS = {'png', 'jpeg', 'jpg', 'gif'}  # Formats browsers can show in an <img>
 
 # Configure max content length
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max-content-length
@@ -159,28 +194,222 @@ if not os.path.exists(TEAM_DIR_FILE):
     with open(TEAM_DIR_FILE, 'w') as f:
         json.dump(default_partners, f, indent=2)
 
+@contextmanager
+def directory_write_lock():
+    """Hold the exclusive lock used for every directory JSON read-modify-write"""
+    if fcntl is None:
+        with _directory_thread_lock:
+            yield
+        return
+    with open(DIRECTORY_LOCK_FILE, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def update_directory(dir_file, key, item_data, item_number_key):
-    with open(dir_file, 'r') as f:
-        directory = json.load(f)
+    with directory_write_lock():
+        with open(dir_file, 'r') as f:
+            directory = json.load(f)
     
-    item_exists = False
-    for i, item in enumerate(directory[key]):
-        if item[item_number_key] == item_data[item_number_key]:
-            item_data['upload_date'] = item.get('upload_date', item_data['upload_date'])
-            directory[key][i] = item_data
-            item_exists = True
-            break
+        item_exists = False
+        for i, item in enumerate(directory[key]):
+            if item[item_number_key] == item_data[item_number_key]:
+                item_data['upload_date'] = item.get('upload_date', item_data['upload_date'])
+                directory[key][i] = item_data
+                item_exists = True
+                break
     
-    if not item_exists:
-        directory[key].append(item_data)
+        if not item_exists:
+            directory[key].append(item_data)
     
-    directory[key].sort(key=lambda x: int(x[item_number_key]))
+        directory[key].sort(key=lambda x: int(x[item_number_key]))
     
-    with open(dir_file, 'w') as f:
-        json.dump(directory, f, indent=2)
+        with open(dir_file, 'w') as f:
+            json.dump(directory, f, indent=2)
+
+# Resource document extraction
+# Uploaded resource documents are processed by a background worker. Results are
+# cached next to the document as resource_<n>_extract.json, resource_<n>_text.txt
+# and resource_<n>_preview.<ext>, then copied into the resource's directory entry.
+# The worker thread is best effort: uWSGI (PythonAnywhere) only runs it with threads
+# enabled, and queued work is lost on reload. `flask --app server extract-resources`
+# processes anything it missed.
+extraction_queue = queue.Queue()
+_extraction_worker = None
+_extraction_worker_lock = threading.Lock()
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+APP_PROPS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}'
+
+def format_file_size(num_bytes):
+    size = float(num_bytes)
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def extract_pdf(filepath, base):
+    """Return (page_count, text, preview_path) for a PDF"""
+    if pymupdf is None:
+        return None, None, None
+    with pymupdf.open(filepath) as doc:
+        text = '\n'.join(page.get_text() for page in doc)
+        preview_path = None
+        if doc.page_count:
+            first_page = doc[0]
+            zoom = PREVIEW_WIDTH / first_page.rect.width
+            preview_path = f"{base}_preview.png"
+            first_page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom)).save(preview_path)
+        return doc.page_count, text, preview_path
+
+def extract_docx(filepath, base):
+    """Return (page_count, text, preview_path) for a DOCX using only the zip contents"""
+    with zipfile.ZipFile(filepath) as docx:
+        names = docx.namelist()
+        document = ElementTree.fromstring(docx.read('word/document.xml'))
+        paragraphs = [
+            ''.join(node.text or '' for node in paragraph.iter(f'{WORD_NS}t'))
+            for paragraph in document.iter(f'{WORD_NS}p')
+        ]
+        text = '\n'.join(paragraphs)
+
+        # Word stores the page count it last rendered in docProps/app.xml
+        page_count = None
+        if 'docProps/app.xml' in names:
+            pages = ElementTree.fromstring(docx.read('docProps/app.xml')).find(f'{APP_PROPS_NS}Pages')
+            if pages is not None and pages.text and pages.text.isdigit():
+                page_count = int(pages.text)
+
+        # Only present when the document was saved with "Save thumbnail". Word on
+        # Windows writes EMF/WMF thumbnails, which browsers can't display, so skip those.
+        preview_path = None
+        thumbnails = [
+            n for n in names
+            if n.startswith('docProps/thumbnail.') and n.rsplit('.', 1)[1].lower() in PREVIEW_EXTENSIONS
+        ]
+        if thumbnails:
+            preview_path = f"{base}_preview.{thumbnails[0].rsplit('.', 1)[1].lower()}"
+            with open(preview_path, 'wb') as f:
+                f.write(docx.read(thumbnails[0]))
+    return page_count, text, preview_path
+
+def extraction_source(filepath):
+    stat = os.stat(filepath)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': EXTRACTION_VERSION}
+
+def cached_resource_extraction(file_path):
+    """Return the cached extraction info for a resource file, or None if missing or stale"""
+    filepath = file_path.lstrip('/')
+    cache_path = f"{filepath.rsplit('.', 1)[0]}_extract.json"
+    if not os.path.exists(filepath) or not os.path.exists(cache_path):
+        return None
+    with open(cache_path, 'r') as f:
+        cached = json.load(f)
+    if cached.get('source') != extraction_source(filepath):
+        return None
+    return cached['info']
+
+def remove_extraction_artifacts(base):
+    """Delete the cache, text and preview files extracted for <base>"""
+    for old_path in [f"{base}_extract.json", f"{base}_text.txt"] + glob.glob(f"{glob.escape(base)}_preview.*"):
+        if os.path.exists(old_path):
+            os.remove(old_path)
+
+def extract_resource_document(file_path, force=False):
+    """Extract size, page count, text and a preview for a resource file, using the cache when fresh.
+
+    Returns (info, error), where error is None on success.
+    """
+    if not force:
+        info = cached_resource_extraction(file_path)
+        if info is not None:
+            return info, None
+
+    filepath = file_path.lstrip('/')
+    base = filepath.rsplit('.', 1)[0]
+    cache_path = f"{base}_extract.json"
+    source = extraction_source(filepath)
+
+    # Clear results from an earlier upload so stale text or previews aren't left behind
+    remove_extraction_artifacts(base)
+
+    page_count, text, preview_path = None, None, None
+    extension = filepath.rsplit('.', 1)[1].lower()
+    # Only cache complete results, so failures are retried and installing PyMuPDF later takes effect
+    error = None
+    if extension == 'pdf' and pymupdf is None:
+        error = "PyMuPDF is not installed"
+    try:
+        if extension == 'pdf':
+            page_count, text, preview_path = extract_pdf(filepath, base)
+        elif extension == 'docx':
+            page_count, text, preview_path = extract_docx(filepath, base)
+    except Exception as e:
+        error = str(e)
+        app.logger.error(f"Extraction error for {file_path}: {str(e)}")
+
+    text_path = None
+    if text:
+        text_path = f"{base}_text.txt"
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    info = {
+        'file_size': source['size'],
+        'page_count': page_count,
+        'preview': f"/{preview_path}" if preview_path else None,
+        'text': f"/{text_path}" if text_path else None
+    }
+    if error is None:
+        with open(cache_path, 'w') as f:
+            json.dump({'source': source, 'info': info}, f, indent=2)
+    return info, error
+
+def apply_resource_extraction(resource_number, file_path, info):
+    """Copy extraction results into the resource entry, if it still points at the same file"""
+    with directory_write_lock():
+        with open(RESOURCES_DIR_FILE, 'r') as f:
+            data = json.load(f)
+        for resource in data['resources']:
+            if resource['resource_number'] == resource_number and resource.get('file') == file_path:
+                resource.update(info)
+                resource['download_size'] = format_file_size(info['file_size'])
+                break
+        else:
+            return
+        with open(RESOURCES_DIR_FILE, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def process_resource(resource_number, file_path, force=False):
+    """Extract a resource file and update its entry. Returns the extraction error, if any"""
+    info, error = extract_resource_document(file_path, force)
+    apply_resource_extraction(resource_number, file_path, info)
+    return error
+
+def extraction_worker():
+    while True:
+        resource_number, file_path = extraction_queue.get()
+        try:
+            process_resource(resource_number, file_path)
+        except Exception as e:
+            app.logger.error(f"Extraction error for {file_path}: {str(e)}")
+        finally:
+            extraction_queue.task_done()
+
+def queue_resource_extraction(resource_number, file_path):
+    """Hand a resource file to the background worker, starting it on first use"""
+    global _extraction_worker
+    with _extraction_worker_lock:
+        if _extraction_worker is None or not _extraction_worker.is_alive():
+            _extraction_worker = threading.Thread(target=extraction_worker, daemon=True)
+            _extraction_worker.start()
+    extraction_queue.put((resource_number, file_path))
 
 @app.route("/upload_case_study", methods=["POST"])
 @token_required
@@ -335,6 +564,8 @@ def upload_resource():
                     filepath = os.path.join(RESOURCES_UPLOAD_FOLDER, filename)
                     file.save(filepath)
                     file_path = f"/static/resources/{filename}"
+            elif is_edit and 'existing_file' in request.form:
+                file_path = request.form.get('existing_file')
 
             resource_data = {
                 'resource_number': resource_number,
@@ -348,7 +579,15 @@ def upload_resource():
                 'download_size': request.form.get('download_size', '')
             }
 
+            # Keep extracted fields for an unchanged file; anything else goes to the worker
+            extraction = cached_resource_extraction(file_path) if file_path else None
+            if extraction:
+                resource_data.update(extraction)
+                resource_data['download_size'] = format_file_size(extraction['file_size'])
+
             update_directory(RESOURCES_DIR_FILE, 'resources', resource_data, 'resource_number')
+            if file_path and not extraction:
+                queue_resource_extraction(resource_number, file_path)
             return jsonify({"message": "Upload successful"}), 200
 
     except Exception as e:
@@ -489,11 +728,12 @@ def handle_login():
 @token_required
 def delete_case_study(case_study_number):
     try:
-        with open(CASE_STUDIES_DIR_FILE, 'r') as f:
-            data = json.load(f)
-        data['case_studies'] = [cs for cs in data['case_studies'] if cs['case_study_number'] != case_study_number]
-        with open(CASE_STUDIES_DIR_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with directory_write_lock():
+            with open(CASE_STUDIES_DIR_FILE, 'r') as f:
+                data = json.load(f)
+            data['case_studies'] = [cs for cs in data['case_studies'] if cs['case_study_number'] != case_study_number]
+            with open(CASE_STUDIES_DIR_FILE, 'w') as f:
+                json.dump(data, f, indent=2)
         return jsonify({"message": "Delete successful"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -502,11 +742,13 @@ def delete_case_study(case_study_number):
 @token_required
 def delete_resource(resource_number):
     try:
-        with open(RESOURCES_DIR_FILE, 'r') as f:
-            data = json.load(f)
-        data['resources'] = [r for r in data['resources'] if r['resource_number'] != resource_number]
-        with open(RESOURCES_DIR_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with directory_write_lock():
+            with open(RESOURCES_DIR_FILE, 'r') as f:
+                data = json.load(f)
+            data['resources'] = [r for r in data['resources'] if r['resource_number'] != resource_number]
+            with open(RESOURCES_DIR_FILE, 'w') as f:
+                json.dump(data, f, indent=2)
+        remove_extraction_artifacts(os.path.join(RESOURCES_UPLOAD_FOLDER, secure_filename(f"resource_{resource_number}")))
         return jsonify({"message": "Delete successful"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -515,11 +757,12 @@ def delete_resource(resource_number):
 @token_required
 def delete_photo_album(album_number):
     try:
-        with open(GALLERY_DIR_FILE, 'r') as f:
-            data = json.load(f)
-        data['albums'] = [a for a in data['albums'] if a['album_number'] != album_number]
-        with open(GALLERY_DIR_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with directory_write_lock():
+            with open(GALLERY_DIR_FILE, 'r') as f:
+                data = json.load(f)
+            data['albums'] = [a for a in data['albums'] if a['album_number'] != album_number]
+            with open(GALLERY_DIR_FILE, 'w') as f:
+                json.dump(data, f, indent=2)
         return jsonify({"message": "Delete successful"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -542,17 +785,18 @@ def update_partner():
         name = request.form.get('name')
         description = request.form.get('description')
         
-        with open(TEAM_DIR_FILE, 'r') as f:
-            partners = json.load(f)
+        with directory_write_lock():
+            with open(TEAM_DIR_FILE, 'r') as f:
+                partners = json.load(f)
         
-        for partner in partners:
-            if partner['id'] == partner_id:
-                partner['name'] = name
-                partner['description'] = description
-                break
+            for partner in partners:
+                if partner['id'] == partner_id:
+                    partner['name'] = name
+                    partner['description'] = description
+                    break
         
-        with open(TEAM_DIR_FILE, 'w') as f:
-            json.dump(partners, f, indent=2)
+            with open(TEAM_DIR_FILE, 'w') as f:
+                json.dump(partners, f, indent=2)
         
         return jsonify({"message": "Partner updated successfully"}), 200
     except Exception as e:
@@ -599,16 +843,17 @@ def add_team_member():
             'image': image_path
         }
         
-        with open(TEAM_DIR_FILE, 'r') as f:
-            partners = json.load(f)
+        with directory_write_lock():
+            with open(TEAM_DIR_FILE, 'r') as f:
+                partners = json.load(f)
         
-        for partner in partners:
-            if partner['id'] == partner_id:
-                partner['members'].append(new_member)
-                break
+            for partner in partners:
+                if partner['id'] == partner_id:
+                    partner['members'].append(new_member)
+                    break
         
-        with open(TEAM_DIR_FILE, 'w') as f:
-            json.dump(partners, f, indent=2)
+            with open(TEAM_DIR_FILE, 'w') as f:
+                json.dump(partners, f, indent=2)
         
         return jsonify({"message": "Team member added successfully"}), 200
     except Exception as e:
@@ -640,28 +885,29 @@ def update_team_member():
                 file.save(filepath)
                 image_path = f"/static/team/{filename}"
         
-        with open(TEAM_DIR_FILE, 'r') as f:
-            partners = json.load(f)
+        with directory_write_lock():
+            with open(TEAM_DIR_FILE, 'r') as f:
+                partners = json.load(f)
         
-        for partner in partners:
-            if partner['id'] == partner_id:
-                for member in partner['members']:
-                    if member['id'] == member_id:
-                        member['name'] = name
-                        member['designation'] = designation
-                        member['role'] = role
-                        member['department'] = department
-                        member['bio'] = bio
-                        member['email'] = email
-                        member['linkedin'] = linkedin
-                        member['twitter'] = twitter
-                        member['webpage'] = webpage
-                        member['image'] = image_path
-                        break
-                break
+            for partner in partners:
+                if partner['id'] == partner_id:
+                    for member in partner['members']:
+                        if member['id'] == member_id:
+                            member['name'] = name
+                            member['designation'] = designation
+                            member['role'] = role
+                            member['department'] = department
+                            member['bio'] = bio
+                            member['email'] = email
+                            member['linkedin'] = linkedin
+                            member['twitter'] = twitter
+                            member['webpage'] = webpage
+                            member['image'] = image_path
+                            break
+                    break
         
-        with open(TEAM_DIR_FILE, 'w') as f:
-            json.dump(partners, f, indent=2)
+            with open(TEAM_DIR_FILE, 'w') as f:
+                json.dump(partners, f, indent=2)
         
         return jsonify({"message": "Team member updated successfully"}), 200
     except Exception as e:
@@ -674,21 +920,238 @@ def delete_team_member():
         partner_id = request.form.get('partner_id')
         member_id = request.form.get('member_id')
         
-        with open(TEAM_DIR_FILE, 'r') as f:
-            partners = json.load(f)
+        with directory_write_lock():
+            with open(TEAM_DIR_FILE, 'r') as f:
+                partners = json.load(f)
         
-        for partner in partners:
-            if partner['id'] == partner_id:
-                partner['members'] = [m for m in partner['members'] if m['id'] != member_id]
-                break
+            for partner in partners:
+                if partner['id'] == partner_id:
+                    partner['members'] = [m for m in partner['members'] if m['id'] != member_id]
+                    break
         
-        with open(TEAM_DIR_FILE, 'w') as f:
-            json.dump(partners, f, indent=2)
+            with open(TEAM_DIR_FILE, 'w') as f:
+                json.dump(partners, f, indent=2)
         
         return jsonify({"message": "Team member deleted successfully"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# Backup & Restore
+# Snapshots live in BACKUP_FOLDER/snapshot_<timestamp>/ with a copy of static/
+# and a manifest.json of sha256 hashes. Files unchanged since the previous
+# snapshot are hard-linked to it, so only new content takes up disk space.
+def copy_with_hash(src, dst):
+    """Stream src to dst in chunks, returning the sha256 of the copied bytes"""
+    digest = hashlib.sha256()
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        for chunk in iter(lambda: fin.read(BACKUP_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            fout.write(chunk)
+    shutil.copystat(src, dst)
+    return digest.hexdigest()
+
+def list_snapshots():
+    if not os.path.isdir(BACKUP_FOLDER):
+        return []
+    return sorted(
+        name for name in os.listdir(BACKUP_FOLDER)
+        if name.startswith('snapshot_') and os.path.exists(os.path.join(BACKUP_FOLDER, name, 'manifest.json'))
+    )
+
+def load_manifest(snapshot):
+    with open(os.path.join(BACKUP_FOLDER, snapshot, 'manifest.json'), 'r') as f:
+        return json.load(f)
+
+def parent_copy_intact(parent_file, previous):
+    """Cheap check that a parent snapshot's copy still matches its manifest entry"""
+    try:
+        stat = os.stat(parent_file)
+    except OSError:
+        return False
+    return stat.st_size == previous['size'] and stat.st_mtime_ns == previous['mtime_ns']
+
+def snapshot_file(src, rel_path, snapshot_static, parent, parent_static):
+    """Add one file to a snapshot, hard-linking it to the parent snapshot when unchanged"""
+    dst = os.path.join(snapshot_static, rel_path)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    stat = os.stat(src)
+    previous = parent.get(rel_path)
+    parent_file = os.path.join(parent_static, rel_path) if previous else None
+    # Never link to a parent copy that has been damaged, or every later snapshot shares the damage
+    parent_ok = previous is not None and parent_copy_intact(parent_file, previous)
+
+    # Same size and mtime as last time - trust the old hash instead of re-reading the file.
+    # We always link to the snapshot copy, never to the live file: uploads overwrite files
+    # in place, which would silently change a hard-linked snapshot as well.
+    if parent_ok and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+        try:
+            os.link(parent_file, dst)
+            return dict(previous), True
+        except OSError:
+            pass
+
+    sha256 = copy_with_hash(src, dst)
+    entry = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if parent_ok and previous['sha256'] == sha256:
+        try:
+            os.remove(dst)
+            os.link(parent_file, dst)
+            # Same content, newer mtime: move the shared copy's mtime along with the manifest
+            os.utime(dst, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            return entry, True
+        except OSError:
+            copy_with_hash(src, dst)
+    return entry, False
+
+def create_snapshot():
+    """Take an incremental snapshot of static/ and return (name, files, linked)"""
+    os.makedirs(BACKUP_FOLDER, exist_ok=True)
+    snapshots = list_snapshots()
+    parent_name = snapshots[-1] if snapshots else None
+    parent = load_manifest(parent_name)['files'] if parent_name else {}
+    parent_static = os.path.join(BACKUP_FOLDER, parent_name, 'static') if parent_name else None
+
+    # Claim a unique name - two backups in the same second get a numbered suffix
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    name = f"snapshot_{timestamp}"
+    attempt = 1
+    while True:
+        tmp_dir = os.path.join(BACKUP_FOLDER, f".tmp_{name}")
+        if not os.path.exists(os.path.join(BACKUP_FOLDER, name)):
+            try:
+                os.mkdir(tmp_dir)
+                break
+            except FileExistsError:
+                pass
+        attempt += 1
+        name = f"snapshot_{timestamp}_{attempt}"
+    snapshot_static = os.path.join(tmp_dir, 'static')
+    files = {}
+    linked = 0
+    try:
+        # Directory files first, all under the write lock so they agree with each other.
+        # Uploads save media before updating the directory, so anything they reference
+        # already exists when the media walk below runs.
+        directory_rel_paths = set()
+        with directory_write_lock():
+            for dir_file in DIRECTORY_FILES:
+                if not os.path.exists(dir_file):
+                    continue
+                rel_path = os.path.relpath(dir_file, STATIC_FOLDER).replace(os.sep, '/')
+                directory_rel_paths.add(rel_path)
+                files[rel_path], was_linked = snapshot_file(dir_file, rel_path, snapshot_static, parent, parent_static)
+                linked += was_linked
+
+        for root, _, filenames in os.walk(STATIC_FOLDER):
+            for filename in filenames:
+                src = os.path.join(root, filename)
+                rel_path = os.path.relpath(src, STATIC_FOLDER).replace(os.sep, '/')
+                if rel_path in directory_rel_paths:
+                    continue
+                files[rel_path], was_linked = snapshot_file(src, rel_path, snapshot_static, parent, parent_static)
+                linked += was_linked
+
+        manifest = {
+            'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'parent': parent_name,
+            'files': files
+        }
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(tmp_dir, os.path.join(BACKUP_FOLDER, name))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return name, len(files), linked
+
+def restore_snapshot(snapshot):
+    """Verify and restore a snapshot, moving the current static/ aside. Returns the aside path"""
+    files = load_manifest(snapshot)['files']
+    snapshot_static = os.path.join(BACKUP_FOLDER, snapshot, 'static')
+    staging = f"{STATIC_FOLDER}.restoring"
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        # Copy rather than link so later uploads can't write through into the snapshot
+        for rel_path, entry in files.items():
+            dst = os.path.join(staging, rel_path)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            sha256 = copy_with_hash(os.path.join(snapshot_static, rel_path), dst)
+            if sha256 != entry['sha256']:
+                raise ValueError(f"Integrity check failed for {rel_path}")
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    aside = f"{STATIC_FOLDER}.before_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    with directory_write_lock():
+        try:
+            os.rename(STATIC_FOLDER, aside)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        try:
+            os.rename(staging, STATIC_FOLDER)
+        except OSError:
+            # Put the live data back so the site is never left without static/
+            os.rename(aside, STATIC_FOLDER)
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    return aside
+
+@app.cli.command('backup')
+def backup_command():
+    """Take an incremental snapshot of static/."""
+    try:
+        name, total, linked = create_snapshot()
+    except OSError as e:
+        raise click.ClickException(f"Backup failed: {e}")
+    click.echo(f"Created {name}: {total} files, {total - linked} new, {linked} unchanged (hard-linked)")
+
+@app.cli.command('list-backups')
+def list_backups_command():
+    """List available snapshots, oldest first."""
+    for name in list_snapshots():
+        manifest = load_manifest(name)
+        click.echo(f"{name}  {manifest['created']}  {len(manifest['files'])} files")
+
+@app.cli.command('restore')
+@click.argument('snapshot', required=False)
+def restore_command(snapshot):
+    """Verify and restore SNAPSHOT (default: the latest one).
+
+    Disable the web app first: uploads save media outside the directory lock,
+    so one landing mid-restore could end up in the folder that is moved aside.
+    """
+    snapshots = list_snapshots()
+    if not snapshots:
+        raise click.ClickException(f"No snapshots found in {BACKUP_FOLDER}")
+    snapshot = snapshot or snapshots[-1]
+    if snapshot not in snapshots:
+        raise click.ClickException(f"Unknown snapshot: {snapshot}")
+    try:
+        aside = restore_snapshot(snapshot)
+    except (ValueError, OSError) as e:
+        raise click.ClickException(f"{e} - nothing was changed")
+    click.echo(f"Restored {snapshot}. Previous data moved to {aside}")
+
+@app.cli.command('extract-resources')
+@click.option('--force', is_flag=True, help='Re-extract even when cached results are up to date.')
+def extract_resources_command(force):
+    """Extract previews and text for every uploaded resource document."""
+    with open(RESOURCES_DIR_FILE, 'r') as f:
+        resources = json.load(f)['resources']
+    for resource in resources:
+        if not resource.get('file'):
+            continue
+        try:
+            error = process_resource(resource['resource_number'], resource['file'], force)
+        except Exception as e:
+            error = str(e)
+        if error:
+            click.echo(f"Failed resource {resource['resource_number']}: {error}", err=True)
+        else:
+            click.echo(f"Extracted resource {resource['resource_number']}: {resource['file']}")
+
 # Static file serving route
 @app.route('/static/<path:filename>')
 def serve_static(filename):
@@ -10,6 +10,9 @@ interface Resource {
   description: string;
   link: string;
   thumbnail?: string;
+  preview?: string | null;
+  page_count?: number | null;
+  download_size?: string;
 }
 
 const Resources = () => {
@@ -164,10 +167,10 @@ const Resources = () => {
                       >
                         <div className="flex items-start">
                           {/* Thumbnail */}
-                          {resource.thumbnail && (
+                          {(resource.thumbnail || resource.preview) && (
                             <div className="flex-shrink-0 w-48 h-48">
                               <img
-                                src={`${backend_url}${resource.thumbnail}`}
+                                src={`${backend_url}${resource.thumbnail || resource.preview}`}
                                 alt={resource.title}
                                 className="w-full h-full object-cover"
                               />
@@ -205,6 +208,15 @@ const Resources = () => {
                                 {resource.description && (
                                   <p className="text-gray-600 leading-relaxed ml-10">{resource.description}</p>
                                 )}
+
+                                {(resource.page_count || resource.download_size) && (
+                                  <p className="text-sm text-gray-500 mt-2 ml-10">
+                                    {[
+                                      resource.page_count && `${resource.page_count} ${resource.page_count === 1 ? 'page' : 'pages'}`,
+                                      resource.download_size
+                                    ].filter(Boolean).join(' · ')}
+                                  </p>
+                                )}
                               </div>
                             </div>
                           </div>
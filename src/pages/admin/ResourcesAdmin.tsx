@@ -98,6 +98,11 @@ export default function ResourcesAdmin() {
         if (!thumbnail && (editingResource as any).thumbnail) {
           formData.append('existing_thumbnail', (editingResource as any).thumbnail);
         }
+
+        // Preserve the uploaded document (and its extracted preview/text)
+        if ((editingResource as any).file) {
+          formData.append('existing_file', (editingResource as any).file);
+        }
       }
       
       if (thumbnail) {
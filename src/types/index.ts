@@ -19,6 +19,10 @@ export interface Resource {
   download_size: string;
   file: string;
   upload_date: string;
+  file_size?: number;
+  page_count?: number | null;
+  preview?: string | null;
+  text?: string | null;
 }
 
 export interface Album {